@@ -6,10 +6,17 @@ import logging
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
+from aiogram.fsm.storage.base import BaseStorage
 from aiogram.fsm.storage.memory import MemoryStorage
 
 from src.bot.handlers import router
-from src.config import config
+from src.config import config, get_provider
+
+try:
+    # uvloop — более быстрый цикл событий (недоступен на Windows)
+    import uvloop
+except ImportError:
+    uvloop = None
 
 
 async def main() -> None:
@@ -33,8 +40,17 @@ async def main() -> None:
         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
     )
 
-    # Storage для FSM (хранение состояний пользователей)
-    storage = MemoryStorage()
+    # Storage для FSM (хранение состояний пользователей).
+    # Redis сохраняет диалоги между перезапусками и позволяет запускать
+    # несколько процессов бота; без REDIS_URL состояния живут в памяти
+    storage: BaseStorage
+    if config.REDIS_URL:
+        from aiogram.fsm.storage.redis import RedisStorage
+
+        storage = RedisStorage.from_url(config.REDIS_URL)
+        logging.info("🗄 Состояния FSM хранятся в Redis")
+    else:
+        storage = MemoryStorage()
 
     # Диспетчер для обработки сообщений
     dp = Dispatcher(storage=storage)
@@ -43,7 +59,7 @@ async def main() -> None:
     dp.include_router(router)
 
     # Информация о провайдере
-    provider = config.get_provider()
+    provider = get_provider()
     logging.info(f"🚀 Бот запускается с провайдером: {provider.name}")
 
     # Запускаем бота
@@ -51,11 +67,15 @@ async def main() -> None:
         logging.info("✅ Бот успешно запущен!")
         await dp.start_polling(bot)
     finally:
+        await provider.close()
         await bot.session.close()
 
 
 if __name__ == "__main__":
+    # Используем uvloop, если он установлен, иначе стандартный asyncio
+    run = uvloop.run if uvloop is not None else asyncio.run
+
     try:
-        asyncio.run(main())
+        run(main())
     except KeyboardInterrupt:
         print("\n👋 Бот остановлен")
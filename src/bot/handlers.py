@@ -1,21 +1,84 @@
 """Обработчики команд и сообщений Telegram бота."""
 
 import asyncio
+from contextlib import suppress
 
 from aiogram import Router
+from aiogram.exceptions import TelegramAPIError
 from aiogram.filters import Command, StateFilter
 from aiogram.fsm.context import FSMContext
-from aiogram.types import BufferedInputFile, CallbackQuery, Message
+from aiogram.types import BufferedInputFile, CallbackQuery, InaccessibleMessage, Message
 
 from src.bot.keyboards import get_frequency_keyboard, get_limit_keyboard
 from src.bot.states import KeywordsState
-from src.config import config
+from src.config import config, get_provider
 from src.utils.excel_exporter import ExporterError, export_to_excel
 from src.utils.parser import ParserError, parse_keywords
 
 # Создаём роутер для регистрации обработчиков
 router = Router()
 
+# Статические тексты собираем один раз при импорте модуля
+_WELCOME_TEXT = (
+    "👋 Привет! Я бот для получения ключевых слов из Яндекс.Wordstat.\n\n"
+    "📝 Отправьте мне список ключевых слов:\n"
+    "• Каждое слово с новой строки\n"
+    "• Или через запятую\n\n"
+    "Пример:\n"
+    "<code>купить iPhone\n"
+    "купить Samsung\n"
+    "смартфон недорого</code>\n\n"
+    "После этого я спрошу, нужна ли вам частотность, "
+    "и отправлю Excel-файл с результатами!"
+)
+
+_CANCEL_TEXT = "❌ Операция отменена.\n\nОтправьте /start для начала работы."
+
+# Шаблоны прогресс-бара: подставляются только меняющиеся числа.
+# Статус обновляется только при реальной смене этапа — каждое обновление
+# стоит отдельного запроса к Telegram API
+_PROGRESS_START = "🔄 Запуск обработки...\n\n▱▱▱▱▱▱▱▱▱▱ 0%"
+_PROGRESS_EXPORT = (
+    "📄 Создание Excel файла...\n\n"
+    "Получено: {found} вариантов\n"
+    "Ключевых слов: {count} из {limit}\n\n"
+    "▰▰▰▰▰▱▱▱▱▱ 50%"
+)
+_PROGRESS_SEND = "📤 Отправка файла...\n\nРазмер: {size} байт\n\n▰▰▰▰▰▰▰▰▰▰ 100%"
+
+
+async def _update_status(status_message: Message | None, text: str) -> None:
+    """Обновить статус-сообщение, не прерывая обработку при ошибке.
+
+    Статус косметический: если его не удалось отправить или Telegram отклонил
+    правку (лимит запросов, "message is not modified"), обработка продолжается.
+
+    Args:
+        status_message: Статус-сообщение или None, если его нет
+        text: Новый текст статуса
+    """
+    if status_message is None:
+        return
+    with suppress(TelegramAPIError):
+        await status_message.edit_text(text)
+
+
+async def _report_error(
+    message: Message | InaccessibleMessage, status_message: Message | None, text: str
+) -> None:
+    """Показать ошибку в статус-сообщении, а без него — отдельным сообщением.
+
+    Args:
+        message: Сообщение, в чат которого отправляется ответ
+        status_message: Статус-сообщение или None, если его нет
+        text: Текст ошибки
+    """
+    if status_message is not None:
+        with suppress(TelegramAPIError):
+            await status_message.edit_text(text)
+            return
+    await message.answer(text)
+
 
 @router.message(Command("start"))
 async def cmd_start(message: Message, state: FSMContext) -> None:
@@ -26,21 +89,7 @@ async def cmd_start(message: Message, state: FSMContext) -> None:
         state: Контекст состояния FSM
     """
     await state.clear()  # Очищаем предыдущее состояние
-
-    welcome_text = (
-        "👋 Привет! Я бот для получения ключевых слов из Яндекс.Wordstat.\n\n"
-        "📝 Отправьте мне список ключевых слов:\n"
-        "• Каждое слово с новой строки\n"
-        "• Или через запятую\n\n"
-        "Пример:\n"
-        "<code>купить iPhone\n"
-        "купить Samsung\n"
-        "смартфон недорого</code>\n\n"
-        "После этого я спрошу, нужна ли вам частотность, "
-        "и отправлю Excel-файл с результатами!"
-    )
-
-    await message.answer(welcome_text, parse_mode="HTML")
+    await message.answer(_WELCOME_TEXT, parse_mode="HTML")
     await state.set_state(KeywordsState.waiting_for_keywords)
 
 
@@ -150,67 +199,73 @@ async def process_limit_choice(callback: CallbackQuery, state: FSMContext) -> No
         await state.clear()
         return
 
-    # Отправляем начальный статус с прогресс-баром
-    status_message = await callback.message.answer("🔄 Запуск обработки...\n\n▱▱▱▱▱▱▱▱▱▱ 0%")
+    # Отправляем начальный статус параллельно с запросом к провайдеру:
+    # оба действия сетевые, и статус не должен задерживать получение данных.
+    # Ошибку провайдера не пробрасываем сразу — её нужно показать в статусе
+    provider = get_provider()
+    status, results = await asyncio.gather(
+        callback.message.answer(_PROGRESS_START),
+        provider.get_keywords(keywords, with_frequency=with_frequency),
+        return_exceptions=True,
+    )
+    status_message: Message | None
+    if isinstance(status, Exception):
+        # Отчёты уже построены — без статуса результат и ошибки
+        # отправляются обычными сообщениями
+        status_message = None
+    elif isinstance(status, BaseException):
+        raise status
+    else:
+        status_message = status
 
     try:
         # Шаг 1: Получение данных
-        await status_message.edit_text("📊 Получение данных из API...\n\n▰▰▱▱▱▱▱▱▱▱ 20%")
-        provider = config.get_provider()
-        results = await provider.get_keywords(keywords, with_frequency=with_frequency)
-
-        # Шаг 2: Расширение ключевых слов
-        await status_message.edit_text(
-            f"🔍 Расширение ключевых слов...\n\n"
-            f"Получено: {len(results)} вариантов\n\n"
-            f"▰▰▰▰▱▱▱▱▱▱ 40%"
-        )
-        await asyncio.sleep(0.5)  # Небольшая задержка для видимости прогресса
+        if isinstance(results, BaseException):
+            raise results
+        found = len(results)
 
-        # Шаг 3: Ограничение результатов
+        # Шаг 2: Ограничение результатов и создание Excel
         results = results[:limit]
-        await status_message.edit_text(
-            f"✂️ Применение лимита...\n\nКлючевых слов: {len(results)} из {limit}\n\n▰▰▰▰▰▰▱▱▱▱ 60%"
-        )
-        await asyncio.sleep(0.3)
-
-        # Шаг 4: Создание Excel
-        await status_message.edit_text(
-            f"📄 Создание Excel файла...\n\nЗаписей: {len(results)}\n\n▰▰▰▰▰▰▰▰▱▱ 80%"
-        )
-        excel_file = export_to_excel(results)
-
-        # Шаг 5: Финализация
-        await status_message.edit_text(
-            f"📤 Отправка файла...\n\nРазмер: {len(excel_file.getvalue())} байт\n\n▰▰▰▰▰▰▰▰▰▰ 100%"
+        await _update_status(
+            status_message,
+            _PROGRESS_EXPORT.format(found=found, count=len(results), limit=limit),
         )
-        await asyncio.sleep(0.3)
-
-        # Готовим файл для отправки
-        input_file = BufferedInputFile(file=excel_file.getvalue(), filename="keywords.xlsx")
-
-        # Отправляем файл
-        await callback.message.answer_document(
-            document=input_file,
-            caption=(
-                f"✅ Готово!\n\n"
-                f"📊 Ключевых слов: {len(results)}\n"
-                f"🔧 Источник: {provider.name}\n"
-                f"📝 Лимит: {limit} слов"
+        # Экспорт синхронный (XML + zip) — выполняем в отдельном потоке,
+        # чтобы не блокировать цикл событий для других пользователей
+        excel_file = await asyncio.to_thread(export_to_excel, results)
+
+        # Шаг 3: Отправка файла параллельно с обновлением статуса.
+        # Правка статуса косметическая и ошибок не выбрасывает, так что
+        # исход gather определяется только отправкой документа.
+        # Содержимое буфера копируется в bytes один раз
+        payload = excel_file.getvalue()
+        input_file = BufferedInputFile(file=payload, filename="keywords.xlsx")
+        await asyncio.gather(
+            _update_status(status_message, _PROGRESS_SEND.format(size=len(payload))),
+            callback.message.answer_document(
+                document=input_file,
+                caption=(
+                    f"✅ Готово!\n\n"
+                    f"📊 Ключевых слов: {len(results)}\n"
+                    f"🔧 Источник: {provider.name}\n"
+                    f"📝 Лимит: {limit} слов"
+                ),
             ),
         )
 
-        # Удаляем статус-сообщение
-        await status_message.delete()
+        # Удаляем статус-сообщение (файл уже отправлен — ошибка удаления не важна)
+        if status_message is not None:
+            with suppress(TelegramAPIError):
+                await status_message.delete()
 
         # Очищаем состояние
         await state.clear()
 
     except ExporterError as e:
-        await status_message.edit_text(f"❌ Ошибка экспорта: {e}")
+        await _report_error(callback.message, status_message, f"❌ Ошибка экспорта: {e}")
         await state.clear()
     except Exception as e:
-        await status_message.edit_text(f"❌ Ошибка получения данных: {e}")
+        await _report_error(callback.message, status_message, f"❌ Ошибка получения данных: {e}")
         await state.clear()
 
     # Подтверждаем callback
@@ -226,4 +281,4 @@ async def cmd_cancel(message: Message, state: FSMContext) -> None:
         state: Контекст состояния FSM
     """
     await state.clear()
-    await message.answer("❌ Операция отменена.\n\nОтправьте /start для начала работы.")
+    await message.answer(_CANCEL_TEXT)
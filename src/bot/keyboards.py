@@ -2,6 +2,22 @@
 
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
+# Клавиатуры неизменны за время жизни бота — создаём их один раз при импорте
+_FREQUENCY_KEYBOARD = InlineKeyboardMarkup(
+    inline_keyboard=[
+        [InlineKeyboardButton(text="📊 С частотностью", callback_data="with_frequency")],
+        [InlineKeyboardButton(text="📝 Без частотности", callback_data="without_frequency")],
+    ]
+)
+
+_LIMIT_KEYBOARD = InlineKeyboardMarkup(
+    inline_keyboard=[
+        [InlineKeyboardButton(text="📝 Первые 50 слов", callback_data="limit_50")],
+        [InlineKeyboardButton(text="📊 Первые 100 слов", callback_data="limit_100")],
+        [InlineKeyboardButton(text="📈 Первые 150 слов", callback_data="limit_150")],
+    ]
+)
+
 
 def get_frequency_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора: с частотностью или без.
@@ -9,13 +25,7 @@ def get_frequency_keyboard() -> InlineKeyboardMarkup:
     Returns:
         InlineKeyboardMarkup с двумя кнопками
     """
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="📊 С частотностью", callback_data="with_frequency")],
-            [InlineKeyboardButton(text="📝 Без частотности", callback_data="without_frequency")],
-        ]
-    )
-    return keyboard
+    return _FREQUENCY_KEYBOARD
 
 
 def get_limit_keyboard() -> InlineKeyboardMarkup:
@@ -24,11 +34,4 @@ def get_limit_keyboard() -> InlineKeyboardMarkup:
     Returns:
         InlineKeyboardMarkup с тремя кнопками (50/100/150 слов)
     """
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [InlineKeyboardButton(text="📝 Первые 50 слов", callback_data="limit_50")],
-            [InlineKeyboardButton(text="📊 Первые 100 слов", callback_data="limit_100")],
-            [InlineKeyboardButton(text="📈 Первые 150 слов", callback_data="limit_150")],
-        ]
-    )
-    return keyboard
+    return _LIMIT_KEYBOARD
@@ -1,6 +1,9 @@
 """Конфигурация проекта и загрузка переменных окружения."""
 
+import functools
+import logging
 import os
+from dataclasses import dataclass, field
 
 from dotenv import load_dotenv
 
@@ -11,49 +14,37 @@ from src.providers.yandex_provider import YandexWordstatProvider
 # Загружаем переменные из .env файла
 load_dotenv()
 
+logger = logging.getLogger(__name__)
 
+
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Конфигурация приложения."""
+    """Конфигурация приложения.
+
+    Значения читаются из окружения один раз при импорте и дальше не меняются.
+    Секреты (токены, URL с паролем) скрыты из repr, чтобы не попасть в логи.
+    """
 
     # Telegram
-    TELEGRAM_BOT_TOKEN: str = os.getenv("TELEGRAM_BOT_TOKEN", "")
+    TELEGRAM_BOT_TOKEN: str = field(default=os.getenv("TELEGRAM_BOT_TOKEN", ""), repr=False)
 
     # Яндекс API
-    YANDEX_OAUTH_TOKEN: str = os.getenv("YANDEX_OAUTH_TOKEN", "")
+    YANDEX_OAUTH_TOKEN: str = field(default=os.getenv("YANDEX_OAUTH_TOKEN", ""), repr=False)
     YANDEX_CLIENT_LOGIN: str | None = os.getenv("YANDEX_CLIENT_LOGIN")
 
+    # Redis для хранения состояний FSM (если не задан — состояния хранятся в памяти)
+    REDIS_URL: str = field(default=os.getenv("REDIS_URL", ""), repr=False)
+
     # Настройки провайдера
     MAX_KEYWORDS: int = int(os.getenv("MAX_KEYWORDS", "200"))
 
-    @classmethod
-    def get_provider(cls) -> WordstatProvider:
-        """Получить провайдер данных (автоматический выбор).
-
-        Логика выбора:
-        - Если есть YANDEX_OAUTH_TOKEN → YandexWordstatProvider
-        - Иначе → MockWordstatProvider
-
-        Returns:
-            Экземпляр провайдера
-        """
-        if cls.YANDEX_OAUTH_TOKEN:
-            print("📊 Используется Yandex Wordstat API")
-            return YandexWordstatProvider(
-                oauth_token=cls.YANDEX_OAUTH_TOKEN,
-                client_login=cls.YANDEX_CLIENT_LOGIN,
-            )
-        else:
-            print("🎭 Используется Mock Provider (тестовые данные)")
-            return MockWordstatProvider()
-
-    @classmethod
-    def validate(cls) -> None:
+    def validate(self) -> None:
         """Проверить обязательные переменные окружения.
 
         Raises:
             ValueError: Если не хватает обязательных переменных
         """
-        if not cls.TELEGRAM_BOT_TOKEN:
+        if not self.TELEGRAM_BOT_TOKEN:
             raise ValueError(
                 "TELEGRAM_BOT_TOKEN не задан! Создайте файл .env и добавьте токен бота."
             )
@@ -61,3 +52,27 @@ class Config:
 
 # Глобальный экземпляр конфигурации
 config = Config()
+
+
+@functools.cache
+def get_provider() -> WordstatProvider:
+    """Получить провайдер данных (автоматический выбор).
+
+    Логика выбора:
+    - Если есть YANDEX_OAUTH_TOKEN → YandexWordstatProvider
+    - Иначе → MockWordstatProvider
+
+    Провайдер создаётся один раз и переиспользуется всеми обработчиками.
+
+    Returns:
+        Экземпляр провайдера
+    """
+    if config.YANDEX_OAUTH_TOKEN:
+        logger.info("📊 Используется Yandex Wordstat API")
+        return YandexWordstatProvider(
+            oauth_token=config.YANDEX_OAUTH_TOKEN,
+            client_login=config.YANDEX_CLIENT_LOGIN,
+        )
+    else:
+        logger.info("🎭 Используется Mock Provider (тестовые данные)")
+        return MockWordstatProvider()
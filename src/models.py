@@ -4,10 +4,13 @@ from dataclasses import dataclass
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class KeywordRow:
     """Строка с данными о ключевом слове.
 
+    Неизменяемая и без __dict__ (slots): таких объектов за один запрос
+    создаются тысячи, а после создания они только читаются.
+
     Attributes:
         keyword: Ключевое слово
         frequency: Частотность (количество показов в месяц), None если не запрашивалась
@@ -1,6 +1,7 @@
 """Базовый интерфейс для провайдеров данных о ключевых словах."""
 
 from abc import ABC, abstractmethod
+from typing import Any, Self
 
 from src.models import KeywordRow
 
@@ -10,6 +11,9 @@ class WordstatProvider(ABC):
 
     Все провайдеры (Mock, Yandex) должны наследоваться от этого класса
     и реализовать метод get_keywords().
+
+    Провайдер можно использовать как асинхронный контекстный менеджер:
+    при выходе вызывается close().
     """
 
     @abstractmethod
@@ -35,3 +39,15 @@ class WordstatProvider(ABC):
     def name(self) -> str:
         """Имя провайдера (для логов и отображения)."""
         pass
+
+    async def close(self) -> None:
+        """Освободить ресурсы провайдера (например, HTTP-соединения).
+
+        По умолчанию ничего не делает.
+        """
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
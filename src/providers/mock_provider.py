@@ -1,7 +1,8 @@
 """Mock-провайдер для тестирования и разработки без реального API."""
 
-import hashlib
+import zlib
 from datetime import datetime
+from functools import lru_cache
 
 from src.models import KeywordRow
 from src.providers.base import WordstatProvider
@@ -27,6 +28,17 @@ class MockWordstatProvider(WordstatProvider):
         """Имя провайдера."""
         return "mock"
 
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _frequency(phrase: str) -> int:
+        """Детерминированная частотность фразы в диапазоне от 100 до 10000.
+
+        CRC32 — быстрый некриптографический хеш: здесь нужна только
+        детерминированность, а не стойкость. Результат кешируется:
+        повторные запросы тех же фраз не пересчитывают хеш.
+        """
+        return 100 + (zlib.crc32(phrase.encode()) % 9900)
+
     async def get_keywords(
         self, phrases: list[str], with_frequency: bool = False
     ) -> list[KeywordRow]:
@@ -37,24 +49,18 @@ class MockWordstatProvider(WordstatProvider):
             with_frequency: Нужно ли генерировать частотность
 
         Returns:
-            Список KeywordRow с mock-данными (только введённые ключи)
+            Список KeywordRow с mock-данными (только введённые ключи, без повторов)
         """
-        results = []
+        # Все строки пачки создаются "в один момент" — берём время один раз
+        now = datetime.now()
 
-        for phrase in phrases:
-            # Генерируем "стабильную" частотность на основе хеша фразы
-            frequency = None
-            if with_frequency:
-                # Используем хеш для генерации числа от 100 до 10000
-                hash_value = int(hashlib.md5(phrase.encode()).hexdigest(), 16)
-                frequency = 100 + (hash_value % 9900)
-
-            row = KeywordRow(
+        return [
+            KeywordRow(
                 keyword=phrase,
-                frequency=frequency,
+                frequency=self._frequency(phrase) if with_frequency else None,
                 source=self.name,
-                created_at=datetime.now(),
+                created_at=now,
             )
-            results.append(row)
-
-        return results
+            # dict.fromkeys убирает повторы за один проход, сохраняя порядок
+            for phrase in dict.fromkeys(phrases)
+        ]
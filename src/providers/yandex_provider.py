@@ -1,14 +1,32 @@
 """Провайдер для работы с Яндекс.Wordstat API."""
 
 import asyncio
+import random
+from collections.abc import Coroutine
 from datetime import datetime
-from typing import Any
+from itertools import chain
+from typing import Any, TypeVar
 
 import httpx
+import orjson
 
 from src.models import KeywordRow
 from src.providers.base import WordstatProvider
 
+# Ограничение API: не больше 10 фраз в одном отчёте Wordstat
+MAX_PHRASES_PER_REPORT = 10
+
+# Повтор запросов при временных ошибках API (429 и 5xx шлюза).
+# 502/504 шлюз может вернуть уже после того, как API выполнил запрос, поэтому
+# неидемпотентные запросы (создание отчёта) повторяются только при 429/503 —
+# когда запрос гарантированно отклонён
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+REJECTED_STATUS_CODES = frozenset({429, 503})
+MAX_REQUEST_ATTEMPTS = 5
+MAX_RETRY_DELAY = 30.0
+
+T = TypeVar("T")
+
 
 class YandexAPIError(Exception):
     """Ошибка при работе с Яндекс API."""
@@ -16,6 +34,45 @@ class YandexAPIError(Exception):
     pass
 
 
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """Задержка перед повтором запроса (секунды).
+
+    Берётся из заголовка Retry-After, если он задан числом секунд,
+    иначе растёт экспоненциально: 1, 2, 4, ... Не больше MAX_RETRY_DELAY.
+    """
+    try:
+        delay = float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        delay = 2.0**attempt
+    return min(delay, MAX_RETRY_DELAY)
+
+
+async def _sem_gather(semaphore: asyncio.Semaphore, *coros: Coroutine[Any, Any, T]) -> list[T]:
+    """Выполнить корутины параллельно, но не больше, чем позволяет семафор.
+
+    Результаты возвращаются в порядке переданных корутин. При первой ошибке
+    остальные задачи отменяются, а ошибка пробрасывается дальше.
+    """
+
+    async def run(coro: Coroutine[Any, Any, T]) -> T:
+        try:
+            async with semaphore:
+                return await coro
+        finally:
+            # Корутина, не успевшая стартовать до отмены, не должна остаться "never awaited"
+            coro.close()
+
+    tasks = [asyncio.ensure_future(run(coro)) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        # Дожидаемся отменённых задач, чтобы они успели удалить свои отчёты
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
 class YandexWordstatProvider(WordstatProvider):
     """Провайдер для получения данных из Яндекс.Wordstat API.
 
@@ -25,10 +82,16 @@ class YandexWordstatProvider(WordstatProvider):
     3. Получает данные
     4. Удаляет отчёт (DeleteWordstatReport)
 
+    Фразы разбиваются на пачки по MAX_PHRASES_PER_REPORT, и пачки
+    обрабатываются параллельно — не больше max_concurrent_reports отчётов
+    одновременно, чтобы не упираться в лимиты API.
+
     Args:
         oauth_token: OAuth-токен Яндекса
         client_login: Логин клиента (если требуется)
         api_url: URL API (по умолчанию reports.api.direct.yandex.ru)
+        max_concurrent_reports: Сколько отчётов можно строить одновременно
+        transport: Транспорт httpx вместо сетевого (например, httpx.MockTransport в тестах)
     """
 
     def __init__(
@@ -36,39 +99,53 @@ class YandexWordstatProvider(WordstatProvider):
         oauth_token: str,
         client_login: str | None = None,
         api_url: str = "https://api.direct.yandex.ru/v4/json/",
+        max_concurrent_reports: int = 5,
+        transport: httpx.AsyncBaseTransport | None = None,
     ):
         self.oauth_token = oauth_token
         self.client_login = client_login
         self.api_url = api_url
-        self._client: httpx.AsyncClient | None = None
+        self._semaphore = asyncio.Semaphore(max_concurrent_reports)
+
+        headers = {
+            "Authorization": f"Bearer {oauth_token}",
+            "Accept-Language": "ru",
+            # Тело запроса сериализуем сами через orjson (см. _make_request)
+            "Content-Type": "application/json",
+        }
+        if client_login:
+            headers["Client-Login"] = client_login
+
+        # Клиент создаётся один раз и живёт между вызовами get_keywords:
+        # соединение с API (HTTP/2, keep-alive) переиспользуется, и TLS-рукопожатие
+        # не повторяется на каждый запрос. Закрывается через close()
+        self._client = httpx.AsyncClient(
+            headers=headers,
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            transport=transport,
+        )
 
     @property
     def name(self) -> str:
         """Имя провайдера."""
         return "yandex"
 
-    async def _get_client(self) -> httpx.AsyncClient:
-        """Получить или создать HTTP клиент."""
-        if self._client is None:
-            headers = {
-                "Authorization": f"Bearer {self.oauth_token}",
-                "Accept-Language": "ru",
-            }
-            if self.client_login:
-                headers["Client-Login"] = self.client_login
-
-            self._client = httpx.AsyncClient(
-                headers=headers,
-                timeout=30.0,
-            )
-        return self._client
+    async def close(self) -> None:
+        """Закрыть HTTP клиент и его пул соединений."""
+        await self._client.aclose()
 
-    async def _make_request(self, method: str, params: dict[str, Any]) -> dict[str, Any]:
+    async def _make_request(
+        self, method: str, params: dict[str, Any], idempotent: bool = True
+    ) -> dict[str, Any]:
         """Выполнить запрос к Яндекс API.
 
         Args:
             method: Название метода API
             params: Параметры метода
+            idempotent: Можно ли безопасно повторить запрос, если неизвестно,
+                выполнил ли его API (при 502/504)
 
         Returns:
             Ответ API
@@ -76,28 +153,43 @@ class YandexWordstatProvider(WordstatProvider):
         Raises:
             YandexAPIError: При ошибке API
         """
-        client = await self._get_client()
+        client = self._client
 
         payload = {
             "method": method,
             "param": params,
         }
 
-        try:
-            response = await client.post(self.api_url, json=payload)
-            response.raise_for_status()
-            data = response.json()
-
-            # Проверяем наличие ошибок в ответе
-            if "error" in data:
-                error_code = data["error"].get("error_code", "unknown")
-                error_msg = data["error"].get("error_string", "Unknown error")
-                raise YandexAPIError(f"API Error [{error_code}]: {error_msg}")
-
-            return data
-
-        except httpx.HTTPError as e:
-            raise YandexAPIError(f"HTTP Error: {e}") from e
+        # Тело одинаковое для всех попыток — сериализуем один раз
+        content = orjson.dumps(payload)
+        retry_statuses = RETRY_STATUS_CODES if idempotent else REJECTED_STATUS_CODES
+        attempt = 0
+
+        while True:
+            try:
+                response = await client.post(self.api_url, content=content)
+                response.raise_for_status()
+                data = orjson.loads(response.content)
+                break
+
+            except httpx.HTTPStatusError as e:
+                # Временные ошибки повторяем с паузой (с учётом Retry-After и джиттера),
+                # чтобы не терять уже созданные отчёты из-за кратковременного сбоя
+                attempt += 1
+                if e.response.status_code not in retry_statuses or attempt >= MAX_REQUEST_ATTEMPTS:
+                    raise YandexAPIError(f"HTTP Error: {e}") from e
+                await asyncio.sleep(_retry_delay(e.response, attempt - 1) + random.uniform(0, 0.5))
+
+            except httpx.HTTPError as e:
+                raise YandexAPIError(f"HTTP Error: {e}") from e
+
+        # Проверяем наличие ошибок в ответе
+        if "error" in data:
+            error_code = data["error"].get("error_code", "unknown")
+            error_msg = data["error"].get("error_string", "Unknown error")
+            raise YandexAPIError(f"API Error [{error_code}]: {error_msg}")
+
+        return data
 
     async def _create_report(self, phrases: list[str]) -> int:
         """Создать отчёт Wordstat.
@@ -109,7 +201,9 @@ class YandexWordstatProvider(WordstatProvider):
             ID созданного отчёта
         """
         params = {"Phrases": phrases}
-        result = await self._make_request("CreateNewWordstatReport", params)
+        # Повтор создания при неясном исходе (502/504) оставил бы "осиротевший"
+        # отчёт, который никто не удалит
+        result = await self._make_request("CreateNewWordstatReport", params, idempotent=False)
 
         if "data" not in result:
             raise YandexAPIError("Не удалось создать отчёт: отсутствует 'data' в ответе")
@@ -117,7 +211,7 @@ class YandexWordstatProvider(WordstatProvider):
         report_id = result["data"]
         return report_id
 
-    async def _get_report(self, report_id: int) -> dict[str, Any] | None:
+    async def _get_report(self, report_id: int) -> list[dict[str, Any]] | None:
         """Получить данные отчёта.
 
         Args:
@@ -145,14 +239,24 @@ class YandexWordstatProvider(WordstatProvider):
         await self._make_request("DeleteWordstatReport", params)
 
     async def _wait_for_report(
-        self, report_id: int, max_wait: int = 60, check_interval: int = 2
-    ) -> dict[str, Any]:
+        self,
+        report_id: int,
+        max_wait: float = 60,
+        initial_delay: float = 1.0,
+        max_delay: float = 30.0,
+    ) -> list[dict[str, Any]]:
         """Ждать готовности отчёта.
 
+        Интервал между проверками растёт экспоненциально (1 → 2 → 4 ... секунд,
+        не больше max_delay) со случайной добавкой до 30%: быстрые отчёты
+        забираются почти сразу, а параллельные ожидания не опрашивают API
+        синхронно.
+
         Args:
             report_id: ID отчёта
             max_wait: Максимальное время ожидания (секунды)
-            check_interval: Интервал проверки (секунды)
+            initial_delay: Первый интервал проверки (секунды)
+            max_delay: Максимальный интервал проверки (секунды)
 
         Returns:
             Данные готового отчёта
@@ -160,20 +264,44 @@ class YandexWordstatProvider(WordstatProvider):
         Raises:
             YandexAPIError: Если отчёт не готов за max_wait секунд
         """
-        elapsed = 0
+        elapsed = 0.0
+        delay = initial_delay
 
-        while elapsed < max_wait:
+        while True:
             data = await self._get_report(report_id)
 
             if data is not None:
                 return data
 
-            # Ждём перед следующей проверкой
-            await asyncio.sleep(check_interval)
-            elapsed += check_interval
+            if elapsed >= max_wait:
+                break
+
+            # Ждём перед следующей проверкой, но не дольше оставшегося времени:
+            # последняя проверка всегда выполняется на границе max_wait
+            sleep_for = min(delay + random.uniform(0, delay * 0.3), max_wait - elapsed)
+            await asyncio.sleep(sleep_for)
+            elapsed += sleep_for
+            delay = min(delay * 2, max_delay)
 
         raise YandexAPIError(f"Timeout: отчёт {report_id} не готов за {max_wait} секунд")
 
+    async def _fetch_report(self, phrases: list[str]) -> list[dict[str, Any]]:
+        """Построить отчёт для одной пачки фраз и получить его данные.
+
+        Отчёт удаляется в любом случае, даже если его не удалось дождаться.
+
+        Args:
+            phrases: Пачка фраз (не больше MAX_PHRASES_PER_REPORT)
+
+        Returns:
+            Данные отчёта
+        """
+        report_id = await self._create_report(phrases)
+        try:
+            return await self._wait_for_report(report_id)
+        finally:
+            await self._delete_report(report_id)
+
     async def get_keywords(
         self, phrases: list[str], with_frequency: bool = False
     ) -> list[KeywordRow]:
@@ -186,59 +314,48 @@ class YandexWordstatProvider(WordstatProvider):
             with_frequency: Получать ли частотность (если False, будет None)
 
         Returns:
-            Список KeywordRow с данными из Wordstat (исходные + вложенные запросы)
+            Список KeywordRow с данными из Wordstat (исходные + вложенные запросы,
+            без повторов)
         """
         try:
-            # 1. Создаём отчёт
-            report_id = await self._create_report(phrases)
-
-            # 2. Ждём готовности
-            report_data = await self._wait_for_report(report_id)
-
-            # 3. Парсим результаты
-            results = []
-            for item in report_data:
-                # Добавляем исходную фразу
-                phrase = item.get("Phrase", "")
-                frequency = None
-                if with_frequency and "Shows" in item:
-                    frequency = item["Shows"]
-
-                row = KeywordRow(
+            # 1-2. Строим отчёты по пачкам фраз параллельно и ждём их готовности
+            batches = [
+                phrases[i : i + MAX_PHRASES_PER_REPORT]
+                for i in range(0, len(phrases), MAX_PHRASES_PER_REPORT)
+            ]
+            reports = await _sem_gather(
+                self._semaphore, *(self._fetch_report(batch) for batch in batches)
+            )
+
+            # 3. Разворачиваем результаты: исходная фраза, затем её вложенные
+            # запросы из SearchedAlso
+            items = chain.from_iterable(
+                chain((item,), item.get("SearchedAlso", ()))
+                for item in chain.from_iterable(reports)
+            )
+
+            # Вложенные запросы разных фраз могут совпадать — оставляем первое
+            # вхождение каждой фразы, порядок сохраняется
+            unique_items: dict[str, dict[str, Any]] = {}
+            for item in items:
+                unique_items.setdefault(item.get("Phrase", ""), item)
+
+            # Одна метка времени на весь результат: все отчёты уже получены,
+            # и строки из разных пачек не должны расходиться по created_at
+            now = datetime.now()
+            source = self.name
+
+            return [
+                KeywordRow(
                     keyword=phrase,
-                    frequency=frequency,
-                    source=self.name,
-                    created_at=datetime.now(),
+                    frequency=item.get("Shows") if with_frequency else None,
+                    source=source,
+                    created_at=now,
                 )
-                results.append(row)
-
-                # Добавляем вложенные запросы из SearchedAlso
-                searched_also = item.get("SearchedAlso", [])
-                for related_item in searched_also:
-                    related_phrase = related_item.get("Phrase", "")
-                    related_frequency = None
-                    if with_frequency and "Shows" in related_item:
-                        related_frequency = related_item["Shows"]
-
-                    related_row = KeywordRow(
-                        keyword=related_phrase,
-                        frequency=related_frequency,
-                        source=self.name,
-                        created_at=datetime.now(),
-                    )
-                    results.append(related_row)
-
-            # 4. Удаляем отчёт
-            await self._delete_report(report_id)
-
-            return results
+                for phrase, item in unique_items.items()
+            ]
 
         except YandexAPIError:
             raise
         except Exception as e:
             raise YandexAPIError(f"Unexpected error: {e}") from e
-        finally:
-            # Закрываем клиент
-            if self._client:
-                await self._client.aclose()
-                self._client = None
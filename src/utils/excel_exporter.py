@@ -1,11 +1,27 @@
 """Экспорт данных о ключевых словах в Excel (.xlsx)."""
 
+from collections.abc import Iterable
 from io import BytesIO
+from operator import attrgetter
+from typing import Literal, overload
 
-import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
 
 from src.models import KeywordRow
 
+# Достаёт все поля KeywordRow одним вызовом (на C) вместо четырёх обращений к атрибутам
+_ROW_FIELDS = attrgetter("keyword", "frequency", "source", "created_at")
+
+# Заголовки и стили одинаковы для всех выгрузок — создаём их один раз при импорте
+_SHEET_TITLE = "Ключевые слова"
+_HEADERS = ("Ключевое слово", "Частотность", "Источник", "Дата создания")
+_HEADER_FONT = Font(bold=True)
+# Формат даты в колонке "Дата создания" (часы с ведущим нулём, как было при записи строкой)
+_DATETIME_FORMAT = "yyyy-mm-dd hh:mm:ss"
+
 
 class ExporterError(Exception):
     """Ошибка при экспорте данных в Excel."""
@@ -13,15 +29,39 @@ class ExporterError(Exception):
     pass
 
 
-def export_to_excel(keywords: list[KeywordRow], filename: str = "keywords.xlsx") -> BytesIO:
+@overload
+def export_to_excel(
+    keywords: Iterable[KeywordRow],
+    filename: str = ...,
+    return_buffer: Literal[False] = ...,
+) -> BytesIO: ...
+
+
+@overload
+def export_to_excel(
+    keywords: Iterable[KeywordRow],
+    filename: str = ...,
+    *,
+    return_buffer: Literal[True],
+) -> memoryview: ...
+
+
+def export_to_excel(
+    keywords: Iterable[KeywordRow],
+    filename: str = "keywords.xlsx",
+    return_buffer: bool = False,
+) -> BytesIO | memoryview:
     """Экспортирует список ключевых слов в Excel файл.
 
     Args:
-        keywords: Список объектов KeywordRow
+        keywords: Объекты KeywordRow (список или любой итератор, строки читаются один раз)
         filename: Имя файла (используется только для метаданных)
+        return_buffer: Вернуть memoryview над содержимым файла вместо BytesIO —
+            для получателей, которые принимают буфер без копирования в bytes
 
     Returns:
-        BytesIO объект с Excel файлом (в памяти, не на диске)
+        BytesIO объект с Excel файлом (в памяти, не на диске),
+        либо memoryview над ним при return_buffer=True
 
     Raises:
         ExporterError: Если список пустой или ошибка при создании файла
@@ -37,48 +77,59 @@ def export_to_excel(keywords: list[KeywordRow], filename: str = "keywords.xlsx")
         >>> print(type(excel_file))
         <class '_io.BytesIO'>
     """
-    if not keywords:
+    widths = [len(header) for header in _HEADERS]
+    # Дата пишется как datetime с форматом _DATETIME_FORMAT,
+    # поэтому ширина колонки с датой фиксированная
+    widths[3] = max(widths[3], len(_DATETIME_FORMAT))
+
+    # Один проход по входным данным: строки собираются в компактные кортежи,
+    # попутно считается максимальная ширина каждой колонки
+    rows = []
+    for keyword, frequency, source, created_at in map(_ROW_FIELDS, keywords):
+        if frequency is None:
+            frequency = "—"
+        for col_idx, value in enumerate((keyword, frequency, source)):
+            length = len(value) if isinstance(value, str) else len(str(value))
+            if length > widths[col_idx]:
+                widths[col_idx] = length
+        rows.append((keyword, frequency, source, created_at))
+
+    if not rows:
         raise ExporterError("Список ключевых слов пустой")
 
-    # Преобразуем список KeywordRow в список словарей для pandas
-    data = []
-    for kw in keywords:
-        row = {
-            "Ключевое слово": kw.keyword,
-            "Частотность": kw.frequency if kw.frequency is not None else "—",
-            "Источник": kw.source,
-            "Дата создания": kw.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-        }
-        data.append(row)
-
     try:
-        # Создаем DataFrame (таблицу)
-        df = pd.DataFrame(data)
+        # write-only режим: строки сразу пишутся в XML, дерево ячеек в памяти не хранится
+        # (с установленным lxml openpyxl пишет XML потоково через lxml.etree.xmlfile)
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(_SHEET_TITLE)
+
+        # Автоматическая ширина колонок (в write-only режиме задаётся до записи строк)
+        for col_idx, max_length in enumerate(widths, 1):
+            adjusted_width = min(max_length + 2, 50)  # Максимум 50 символов
+            worksheet.column_dimensions[get_column_letter(col_idx)].width = adjusted_width
+
+        # Закрепляем строку заголовка, чтобы она оставалась видна при прокрутке
+        worksheet.freeze_panes = "A2"
+
+        # Заголовок жирным шрифтом
+        header_cells = []
+        for header in _HEADERS:
+            cell = WriteOnlyCell(worksheet, value=header)
+            cell.font = _HEADER_FONT
+            header_cells.append(cell)
+        worksheet.append(header_cells)
+
+        for keyword, frequency, source, created_at in rows:
+            date_cell = WriteOnlyCell(worksheet, value=created_at)
+            date_cell.number_format = _DATETIME_FORMAT
+            worksheet.append((keyword, frequency, source, date_cell))
 
         # Создаем BytesIO объект (виртуальный файл в памяти)
         output = BytesIO()
+        workbook.save(output)
 
-        # Записываем Excel в память с помощью openpyxl
-        with pd.ExcelWriter(output, engine="openpyxl") as writer:
-            df.to_excel(writer, index=False, sheet_name="Ключевые слова")
-
-            # Получаем доступ к worksheet для форматирования
-            worksheet = writer.sheets["Ключевые слова"]
-
-            # Автоматическая ширина колонок
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except Exception:
-                        pass
-
-                adjusted_width = min(max_length + 2, 50)  # Максимум 50 символов
-                worksheet.column_dimensions[column_letter].width = adjusted_width
+        if return_buffer:
+            return output.getbuffer()
 
         # Возвращаем указатель в начало файла
         output.seek(0)
@@ -2,6 +2,10 @@
 
 import re
 
+# Ключевое слово — всё между разделителями: переносом строки, запятой, точкой с запятой
+# (компилируем один раз при импорте)
+_KEYWORD_RE = re.compile(r"[^\n,;]+")
+
 
 class ParserError(Exception):
     """Ошибка при парсинге ключевых слов."""
@@ -25,7 +29,8 @@ def parse_keywords(text: str, max_keywords: int = 200) -> list[str]:
         Список уникальных ключевых слов (в том же порядке, в каком встречались)
 
     Raises:
-        ParserError: Если текст пустой или нет ни одного ключевого слова
+        ParserError: Если текст пустой, нет ни одного ключевого слова
+            или уникальных ключевых слов больше max_keywords
 
     Examples:
         >>> parse_keywords("купить телефон\\nкупить iPhone")
@@ -37,39 +42,31 @@ def parse_keywords(text: str, max_keywords: int = 200) -> list[str]:
     if not text or not text.strip():
         raise ParserError("Текст не может быть пустым")
 
-    # Разделяем по переносам строк и запятым
-    # Сначала разбиваем по переносам строк
-    lines = text.split("\n")
-
-    keywords = []
-    seen = set()  # Для отслеживания дубликатов
+    # Ключ — слово после casefold (для поиска дубликатов), значение — слово
+    # в исходном написании. dict сохраняет порядок первого появления
+    unique: dict[str, str] = {}
 
-    for line in lines:
-        # Разбиваем каждую строку по запятым
-        parts = re.split(r",|;", line)
+    # Проходим по тексту лениво (finditer), чтобы при превышении лимита
+    # не разбирать хвост огромного сообщения
+    for match in _KEYWORD_RE.finditer(text):
+        # split() без аргументов убирает пробелы по краям и заодно
+        # нормализует пробелы внутри (несколько пробелов → один)
+        keyword = " ".join(match.group().split())
 
-        for part in parts:
-            # Убираем пробелы по краям
-            keyword = part.strip()
+        # Пропускаем пустые строки
+        if not keyword:
+            continue
 
-            # Пропускаем пустые строки
-            if not keyword:
-                continue
+        # Добавляем только если не встречали ранее (без учёта регистра;
+        # casefold корректно сравнивает и не только кириллицу/латиницу, например ß и SS)
+        unique.setdefault(keyword.casefold(), keyword)
 
-            # Нормализуем пробелы внутри (несколько пробелов → один)
-            keyword = " ".join(keyword.split())
-
-            # Добавляем только если не встречали ранее
-            if keyword.lower() not in seen:
-                keywords.append(keyword)
-                seen.add(keyword.lower())
+        # Проверяем лимит сразу, не дожидаясь конца текста
+        if len(unique) > max_keywords:
+            raise ParserError(f"Слишком много ключевых слов. Максимум: {max_keywords}")
 
     # Проверяем, что получили хотя бы одно ключевое слово
-    if not keywords:
+    if not unique:
         raise ParserError("Не найдено ни одного ключевого слова в тексте")
 
-    # Проверяем лимит
-    if len(keywords) > max_keywords:
-        raise ParserError(f"Слишком много ключевых слов: {len(keywords)}. Максимум: {max_keywords}")
-
-    return keywords
+    return list(unique.values())
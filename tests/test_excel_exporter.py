@@ -58,3 +58,59 @@ def test_export_to_excel_file_readable():
     assert len(df) == 2
     assert list(df["Ключевое слово"]) == ["test1", "test2"]
     assert df["Источник"].tolist() == ["mock", "yandex"]
+
+
+def test_export_to_excel_accepts_iterator():
+    """Тест что генератор принимается и читается один раз."""
+    import pandas as pd
+
+    rows = (KeywordRow(f"test{i}", i, "mock", datetime.now()) for i in range(3))
+
+    excel_file = export_to_excel(rows)
+    df = pd.read_excel(excel_file, engine="openpyxl")
+
+    assert list(df["Ключевое слово"]) == ["test0", "test1", "test2"]
+
+
+def test_export_to_excel_empty_iterator():
+    """Тест ошибки при пустом итераторе."""
+    with pytest.raises(ExporterError, match="Список ключевых слов пустой"):
+        export_to_excel(iter([]))
+
+
+def test_export_to_excel_writes_native_datetime():
+    """Тест что дата записывается как datetime, а не как строка."""
+    from openpyxl import load_workbook
+
+    created_at = datetime(2024, 5, 17, 9, 30, 15)
+    rows = [KeywordRow("test", 100, "mock", created_at)]
+
+    worksheet = load_workbook(export_to_excel(rows)).active
+
+    assert worksheet["D2"].value == created_at
+    assert worksheet["D2"].is_date
+    assert worksheet["D2"].number_format == "yyyy-mm-dd hh:mm:ss"
+
+
+def test_export_to_excel_freezes_header():
+    """Тест что строка заголовка закреплена."""
+    from openpyxl import load_workbook
+
+    rows = [KeywordRow("test", 100, "mock", datetime.now())]
+
+    worksheet = load_workbook(export_to_excel(rows)).active
+
+    assert worksheet.freeze_panes == "A2"
+
+
+def test_export_to_excel_return_buffer():
+    """Тест возврата memoryview без копирования содержимого."""
+    from openpyxl import load_workbook
+
+    rows = [KeywordRow("test", 100, "mock", datetime.now())]
+
+    buffer = export_to_excel(rows, return_buffer=True)
+
+    assert isinstance(buffer, memoryview)
+    worksheet = load_workbook(BytesIO(buffer)).active
+    assert worksheet["A2"].value == "test"
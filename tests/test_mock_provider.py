@@ -60,3 +60,13 @@ async def test_mock_provider_name():
     """Тест имени провайдера."""
     provider = MockWordstatProvider()
     assert provider.name == "mock"
+
+
+@pytest.mark.asyncio
+async def test_mock_provider_removes_duplicates():
+    """Тест удаления повторяющихся фраз с сохранением порядка."""
+    provider = MockWordstatProvider()
+
+    result = await provider.get_keywords(["b", "a", "b", "c", "a"], with_frequency=False)
+
+    assert [row.keyword for row in result] == ["b", "a", "c"]
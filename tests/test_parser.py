@@ -33,6 +33,13 @@ def test_parse_keywords_removes_duplicates():
     assert result == ["test", "test2"]
 
 
+def test_parse_keywords_removes_duplicates_casefold():
+    """Тест удаления дубликатов, которые совпадают только после casefold."""
+    text = "Straße\nSTRASSE\nКУПИТЬ\nкупить"
+    result = parse_keywords(text)
+    assert result == ["Straße", "КУПИТЬ"]
+
+
 def test_parse_keywords_strips_whitespace():
     """Тест удаления пробелов по краям."""
     text = "  слово1  ,  слово2  \n  слово3  "
@@ -78,3 +85,10 @@ def test_parse_keywords_custom_max_limit():
     text = "слово1, слово2, слово3"
     with pytest.raises(ParserError, match="Слишком много ключевых слов"):
         parse_keywords(text, max_keywords=2)
+
+
+def test_parse_keywords_limit_counts_unique_only():
+    """Тест что дубликаты не учитываются в лимите."""
+    text = "слово1, СЛОВО1, слово2, слово2"
+    result = parse_keywords(text, max_keywords=2)
+    assert result == ["слово1", "слово2"]
@@ -0,0 +1,250 @@
+"""Тесты для Yandex провайдера (без сети, через httpx.MockTransport)."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.providers.yandex_provider import YandexAPIError, YandexWordstatProvider
+
+
+class FakeWordstatAPI:
+    """Имитация Wordstat API: отчёты готовы сразу после создания."""
+
+    def __init__(self):
+        self.reports: dict[int, list[str]] = {}
+        self.created: list[list[str]] = []
+        self.max_active = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0)  # Отдаём управление, как при настоящем сетевом запросе
+        payload = json.loads(request.content)
+        method, param = payload["method"], payload["param"]
+
+        if method == "CreateNewWordstatReport":
+            self.created.append(param["Phrases"])
+            report_id = len(self.created)
+            self.reports[report_id] = param["Phrases"]
+            self.max_active = max(self.max_active, len(self.reports))
+            return httpx.Response(200, json={"data": report_id})
+
+        if method == "GetWordstatReport":
+            data = [
+                {
+                    "Phrase": phrase,
+                    "Shows": len(phrase),
+                    "SearchedAlso": [{"Phrase": "общая фраза", "Shows": 1}],
+                }
+                for phrase in self.reports[param["ReportID"]]
+            ]
+            return httpx.Response(200, json={"data": data})
+
+        if method == "DeleteWordstatReport":
+            del self.reports[param["ReportID"]]
+            return httpx.Response(200, json={"data": 1})
+
+        return httpx.Response(400)
+
+
+class TrackingTransport(httpx.MockTransport):
+    """MockTransport, запоминающий, закрыт ли он."""
+
+    def __init__(self, handler):
+        super().__init__(handler)
+        self.is_closed = False
+
+    async def aclose(self) -> None:
+        self.is_closed = True
+
+
+def make_provider(handler, **kwargs) -> YandexWordstatProvider:
+    """Создать провайдер, который отправляет запросы в handler вместо сети."""
+    return YandexWordstatProvider(
+        oauth_token="test-token", transport=httpx.MockTransport(handler), **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_yandex_provider_splits_phrases_into_reports():
+    """Тест разбиения фраз на отчёты по 10 штук с ограничением параллельности."""
+    api = FakeWordstatAPI()
+    phrases = [f"фраза {i}" for i in range(25)]
+
+    async with make_provider(api, max_concurrent_reports=2) as provider:
+        result = await provider.get_keywords(phrases, with_frequency=True)
+
+    assert [len(batch) for batch in api.created] == [10, 10, 5]
+    assert api.max_active == 2
+    assert api.reports == {}  # Все отчёты удалены
+    assert [row.keyword for row in result] == [phrases[0], "общая фраза", *phrases[1:]]
+    assert result[0].frequency == len(phrases[0])
+
+
+@pytest.mark.asyncio
+async def test_yandex_provider_without_frequency():
+    """Тест что без частотности frequency = None."""
+    api = FakeWordstatAPI()
+    async with make_provider(api) as provider:
+        result = await provider.get_keywords(["test"], with_frequency=False)
+
+    assert all(row.frequency is None for row in result)
+    assert all(row.source == "yandex" for row in result)
+
+
+@pytest.mark.asyncio
+async def test_yandex_provider_wait_uses_backoff(monkeypatch):
+    """Тест что интервал опроса отчёта растёт экспоненциально (с джиттером)."""
+    provider = make_provider(FakeWordstatAPI())
+    responses = iter([None, None, None, [{"Phrase": "test"}]])
+    delays = []
+
+    async def fake_get_report(report_id):
+        return next(responses)
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(provider, "_get_report", fake_get_report)
+    monkeypatch.setattr("src.providers.yandex_provider.asyncio.sleep", fake_sleep)
+
+    async with provider:
+        result = await provider._wait_for_report(1)
+
+    assert result == [{"Phrase": "test"}]
+    assert len(delays) == 3
+    for delay, base in zip(delays, [1, 2, 4], strict=True):
+        assert base <= delay <= base * 1.3
+
+
+@pytest.mark.asyncio
+async def test_yandex_provider_wait_polls_until_max_wait(monkeypatch):
+    """Тест что медленный отчёт (готов на ~45 с) забирается при max_wait=60."""
+    provider = make_provider(FakeWordstatAPI())
+    clock = 0.0
+    polls = []
+
+    async def fake_get_report(report_id):
+        polls.append(clock)
+        return [{"Phrase": "test"}] if clock >= 45 else None
+
+    async def fake_sleep(delay):
+        nonlocal clock
+        clock += delay
+
+    monkeypatch.setattr(provider, "_get_report", fake_get_report)
+    monkeypatch.setattr("src.providers.yandex_provider.asyncio.sleep", fake_sleep)
+
+    async with provider:
+        result = await provider._wait_for_report(1, max_wait=60)
+
+    assert result == [{"Phrase": "test"}]
+    assert polls[-1] == pytest.approx(60)
+
+
+@pytest.mark.asyncio
+async def test_yandex_provider_wait_times_out(monkeypatch):
+    """Тест что отчёт, не готовый к max_wait, даёт Timeout после финальной проверки."""
+    provider = make_provider(FakeWordstatAPI())
+    clock = 0.0
+    polls = []
+
+    async def fake_get_report(report_id):
+        polls.append(clock)
+        return None
+
+    async def fake_sleep(delay):
+        nonlocal clock
+        clock += delay
+
+    monkeypatch.setattr(provider, "_get_report", fake_get_report)
+    monkeypatch.setattr("src.providers.yandex_provider.asyncio.sleep", fake_sleep)
+
+    async with provider:
+        with pytest.raises(YandexAPIError, match="Timeout"):
+            await provider._wait_for_report(1, max_wait=60)
+
+    assert polls[-1] == pytest.approx(60)
+    assert clock == pytest.approx(60)
+
+
+@pytest.mark.asyncio
+async def test_yandex_provider_reuses_client_until_closed():
+    """Тест что HTTP клиент живёт между вызовами и закрывается при выходе из контекста."""
+    api = FakeWordstatAPI()
+    transport = TrackingTransport(api)
+    provider = YandexWordstatProvider(oauth_token="test-token", transport=transport)
+
+    async with provider:
+        await provider.get_keywords(["test1"])
+        await provider.get_keywords(["test2"])
+
+        assert api.created == [["test1"], ["test2"]]
+        assert not transport.is_closed
+
+    assert transport.is_closed
+
+
+@pytest.mark.asyncio
+async def test_yandex_provider_retries_transient_errors(monkeypatch):
+    """Тест повтора запроса при 503 с учётом заголовка Retry-After."""
+    statuses = iter([503, 503, 200])
+    delays = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = next(statuses)
+        if status != 200:
+            return httpx.Response(status, headers={"Retry-After": "3"})
+        return httpx.Response(200, json={"data": 42})
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr("src.providers.yandex_provider.asyncio.sleep", fake_sleep)
+    async with make_provider(handler) as provider:
+        result = await provider._make_request("CreateNewWordstatReport", {"Phrases": ["test"]})
+
+    assert result == {"data": 42}
+    assert len(delays) == 2
+    assert all(3 <= delay <= 3.5 for delay in delays)
+
+
+@pytest.mark.asyncio
+async def test_yandex_provider_does_not_retry_client_errors():
+    """Тест что ошибки клиента (4xx, кроме 429) не повторяются."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(400)
+
+    async with make_provider(handler) as provider:
+        with pytest.raises(YandexAPIError, match="HTTP Error"):
+            await provider._make_request("CreateNewWordstatReport", {"Phrases": ["test"]})
+
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_yandex_provider_retries_gateway_errors_only_for_idempotent(monkeypatch):
+    """Тест что 502 повторяется для GetWordstatReport, но не для создания отчёта."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(json.loads(request.content)["method"])
+        if len(calls) == 1:
+            return httpx.Response(502)
+        return httpx.Response(200, json={"data": [{"Phrase": "test"}]})
+
+    async def fake_sleep(delay):
+        pass
+
+    monkeypatch.setattr("src.providers.yandex_provider.asyncio.sleep", fake_sleep)
+    async with make_provider(handler) as provider:
+        assert await provider._get_report(1) == [{"Phrase": "test"}]
+        assert calls == ["GetWordstatReport", "GetWordstatReport"]
+
+        calls.clear()
+        with pytest.raises(YandexAPIError, match="HTTP Error"):
+            await provider._create_report(["test"])
+        assert calls == ["CreateNewWordstatReport"]